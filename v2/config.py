@@ -1,4 +1,5 @@
 """Configuration settings for NLP project."""
+import os
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).parent
@@ -22,6 +23,8 @@ DATA_FILES = {
 }
 
 MIN_WORD_LENGTH = 3
+PREPROCESS_WORKERS = os.cpu_count() or 1
+PREPROCESS_CHUNKSIZE = 8
 TOP_WORDS_LIMIT = 1000
 CORE_LEXICON_THRESHOLD = 0.5
 
@@ -33,6 +36,15 @@ DOMAIN_BOOST = 2.0
 MIN_ENTITY_FREQUENCY = 2
 MIN_PERSON_FREQUENCY = 1
 
+MORPH_CACHE_SIZE = 200_000
+
+NER_WORKERS = os.cpu_count() or 1
+NER_CHUNKSIZE = 4
+NER_BATCH_SIZE = 32
+NER_CHUNK_CHARS = 10_000
+NER_PROCESSES = max(1, (os.cpu_count() or 1) // 2)
+SPACY_DISABLED_PIPES = ['parser', 'tagger', 'lemmatizer', 'attribute_ruler']
+
 GRAPH_DPI = 300
 GRAPH_FIGSIZE = (12, 8)
 
@@ -42,14 +54,10 @@ def load_text_file(filepath: Path, skip_comments: bool = True) -> list[str]:
     if not filepath.exists():
         return []
     
-    lines = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if skip_comments and (not line or line.startswith('#')):
-                continue
-            lines.append(line)
-    return lines
+    lines = [line.strip() for line in filepath.read_text(encoding='utf-8').splitlines()]
+    if not skip_comments:
+        return lines
+    return [line for line in lines if line and not line.startswith('#')]
 
 
 def load_abbr_map(filepath: Path) -> dict[str, str]:
@@ -57,13 +65,9 @@ def load_abbr_map(filepath: Path) -> dict[str, str]:
     if not filepath.exists():
         return {}
     
-    mapping = {}
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            if '=' in line:
-                key, value = line.split('=', 1)
-                mapping[key.strip()] = value.strip()
-    return mapping
+    entries = (line.strip().partition('=') for line in filepath.read_text(encoding='utf-8').splitlines())
+    return {
+        key.strip(): value.strip()
+        for key, sep, value in entries
+        if sep and not key.startswith('#')
+    }
@@ -1,9 +1,14 @@
 """Cache manager for storing intermediate results."""
-import pickle
+import mmap
+import struct
 from pathlib import Path
 
+import msgspec
+
 import config
 
+HEADER = struct.Struct('>I')
+
 
 class CacheManager:
     """Manages caching of analysis results."""
@@ -11,30 +16,53 @@ class CacheManager:
     def __init__(self):
         self.cache_dir = config.CACHE_DIR
         self.cache_dir.mkdir(exist_ok=True)
+        self._enc = msgspec.msgpack.Encoder()
+        self._dec = msgspec.msgpack.Decoder()
+    
+    def _path(self, name: str) -> Path:
+        """Get msgpack cache file path."""
+        return self.cache_dir / f"{name}.msgpack"
+    
+    def _read_mapped(self, filepath: Path, decode):
+        """Map file read-only and decode it without copying into memory."""
+        with open(filepath, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as buf:
+                return decode(buf)
+        finally:
+            mm.close()
+    
+    def _decode_frame(self, buf: memoryview):
+        """Decode length-prefixed msgpack frame."""
+        (size,) = HEADER.unpack_from(buf)
+        with buf[HEADER.size:HEADER.size + size] as payload:
+            return self._dec.decode(payload)
     
     def save(self, name: str, data: dict):
         """Save data to cache."""
-        filepath = self.cache_dir / f"{name}.pkl"
-        with open(filepath, 'wb') as f:
-            pickle.dump(data, f)
+        payload = self._enc.encode(data)
+        with open(self._path(name), 'wb') as f:
+            f.write(HEADER.pack(len(payload)))
+            f.write(payload)
     
     def load(self, name: str):
         """Load data from cache."""
-        filepath = self.cache_dir / f"{name}.pkl"
+        filepath = self._path(name)
         if not filepath.exists():
             return None
         
-        with open(filepath, 'rb') as f:
-            return pickle.load(f)
+        return self._read_mapped(filepath, self._decode_frame)
     
     def exists(self, name: str) -> bool:
         """Check if cache exists."""
-        filepath = self.cache_dir / f"{name}.pkl"
-        return filepath.exists()
+        return self._path(name).exists()
     
     def clear_all(self):
         """Clear all cache files."""
-        for filepath in self.cache_dir.glob("*.pkl"):
+        for filepath in self.cache_dir.glob("*.msgpack"):
             filepath.unlink()
     
     def get_status(self) -> dict:
@@ -43,7 +71,7 @@ class CacheManager:
         status = {}
         
         for module in modules:
-            filepath = self.cache_dir / f"{module}.pkl"
+            filepath = self._path(module)
             status[module] = {
                 'exists': filepath.exists(),
                 'size': f"{filepath.stat().st_size / 1024:.1f} KB" if filepath.exists() else None
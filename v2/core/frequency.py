@@ -1,6 +1,7 @@
 """Frequency analysis module."""
-from collections import Counter
+from itertools import chain
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -12,35 +13,31 @@ class FrequencyAnalyzer:
     
     def __init__(self):
         self.results = None
+        self.freq_df = None
     
     def analyze(self, lemma_lists: list[list[str]]) -> dict:
         """Perform frequency analysis."""
-        all_lemmas = [lemma for lemmas in lemma_lists for lemma in lemmas]
-        freq_counter = Counter(all_lemmas)
-        sorted_lemmas = freq_counter.most_common()
+        lemmas = pd.Series(list(chain.from_iterable(lemma_lists)), dtype=object)
+        counts = lemmas.value_counts(sort=False).sort_values(ascending=False, kind='stable')
+        freqs = counts.to_numpy()
+        cumulative = np.cumsum(freqs)
         
-        M = len(all_lemmas)
-        N = len(freq_counter)
+        M = len(lemmas)
+        N = len(counts)
         K_R = (N / M) * 100 if M > 0 else 0
         K_I = M / N if N > 0 else 0
         
-        freq_dict = []
-        cumulative = 0
-        for rank, (lemma, freq) in enumerate(sorted_lemmas, 1):
-            cumulative += freq
-            freq_dict.append({
-                'lemma': lemma,
-                'frequency': freq,
-                'rank': rank,
-                'relative_freq': (freq / M) * 100,
-                'cumulative_freq': cumulative
-            })
+        self.freq_df = pd.DataFrame({
+            'lemma': counts.index,
+            'frequency': freqs,
+            'rank': np.arange(1, N + 1),
+            'relative_freq': freqs / M * 100 if M > 0 else np.zeros(N),
+            'cumulative_freq': cumulative
+        })
         
         core_size = 0
-        for item in freq_dict:
-            if item['cumulative_freq'] >= M * config.CORE_LEXICON_THRESHOLD:
-                core_size = item['rank']
-                break
+        if M > 0:
+            core_size = int(np.searchsorted(cumulative, M * config.CORE_LEXICON_THRESHOLD)) + 1
         
         self.results = {
             'M': M,
@@ -48,7 +45,7 @@ class FrequencyAnalyzer:
             'K_R': K_R,
             'K_I': K_I,
             'core_lexicon_size': core_size,
-            'freq_dict': freq_dict
+            'freq_dict': self.freq_df.to_dict('records')
         }
         
         return self.results
@@ -60,8 +57,9 @@ class FrequencyAnalyzer:
         
         output_dir = Path(output_dir)
         
-        df = pd.DataFrame(self.results['freq_dict'])
-        df.to_csv(output_dir / 'frequency_dict.csv', index=False, sep=';', encoding='utf-8-sig')
+        self.freq_df.to_csv(
+            output_dir / 'frequency_dict.csv', index=False, sep=';', encoding='utf-8-sig', chunksize=100_000
+        )
         
         stats_file = output_dir / 'statistics.txt'
         with open(stats_file, 'w', encoding='utf-8') as f:
@@ -78,15 +76,15 @@ class FrequencyAnalyzer:
         if not self.results:
             return
         
-        freq_dict = self.results['freq_dict'][:1000]
-        ranks = [item['rank'] for item in freq_dict]
-        freqs = [item['frequency'] for item in freq_dict]
+        top = self.freq_df.head(1000)
+        ranks = top['rank'].to_numpy()
+        freqs = top['frequency'].to_numpy()
         
         plt.figure(figsize=config.GRAPH_FIGSIZE)
         plt.loglog(ranks, freqs, 'b.', alpha=0.5, label='Фактическое')
         
         C = freqs[0]
-        theoretical = [C / r for r in ranks]
+        theoretical = C / ranks
         plt.loglog(ranks, theoretical, 'r--', label='Теоретическое (закон Ципфа)')
         
         plt.xlabel('Ранг (log)')
@@ -103,9 +101,8 @@ class FrequencyAnalyzer:
         if not self.results:
             return
         
-        freq_dict = self.results['freq_dict']
-        ranks = [item['rank'] for item in freq_dict]
-        cumulative = [item['cumulative_freq'] for item in freq_dict]
+        ranks = self.freq_df['rank'].to_numpy()
+        cumulative = self.freq_df['cumulative_freq'].to_numpy()
         
         M = self.results['M']
         core_size = self.results['core_lexicon_size']
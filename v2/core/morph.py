@@ -0,0 +1,10 @@
+"""Shared pymorphy3 analyzer."""
+from functools import lru_cache
+
+import pymorphy3
+
+
+@lru_cache(maxsize=1)
+def get_morph() -> pymorphy3.MorphAnalyzer:
+    """Get process-wide Russian morphological analyzer (tuple parses)."""
+    return pymorphy3.MorphAnalyzer(result_type=None)
@@ -1,6 +1,9 @@
 """Named Entity Recognition (NER) module."""
 import re
+import sys
 from collections import Counter, defaultdict
+from functools import cached_property, lru_cache
+from itertools import chain
 from pathlib import Path
 import pandas as pd
 
@@ -8,7 +11,6 @@ from natasha import (
     Segmenter,
     MorphVocab,
     NewsEmbedding,
-    NewsMorphTagger,
     NewsNERTagger,
     Doc
 )
@@ -16,37 +18,185 @@ from natasha import (
 import spacy
 import pymorphy3
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 import config
+from core.parallel import forks_by_default, map_in_pool
+
+_intern = sys.intern
+
+_PERSON_RE = re.compile(
+    r'^(?:[А-ЯЁA-Z][а-яёa-z]+\s+[А-ЯЁA-Z]\.\s*[А-ЯЁA-Z]\.'
+    r'|[А-ЯЁA-Z]\.\s*[А-ЯЁA-Z]\.\s+[А-ЯЁA-Z][а-яёa-z]+'
+    r'|[А-ЯЁA-Z][а-яёa-z]+\s+[А-ЯЁA-Z][а-яёa-z]+)'
+)
+
+_PERSON_EXCLUDE_TERMS = ['parallel distrib', 'et al', 'proc', 'ieee']
+_ORG_MARKERS = ['университет', 'институт', 'university', 'company', 'institute', 'corporation']
+
+
+def _build_automaton(markers) -> 'ahocorasick.Automaton | None':
+    """Build Aho-Corasick automaton over markers if pyahocorasick is available."""
+    if ahocorasick is None or not markers:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for marker in markers:
+        automaton.add_word(marker, marker)
+    automaton.make_automaton()
+    return automaton
+
+
+def _contains_any(automaton, markers, text: str) -> bool:
+    """Check if text contains any of markers."""
+    if automaton is not None:
+        return next(automaton.iter(text), None) is not None
+    return any(marker in text for marker in markers)
+
+
+def _iter_chunks(text: str, max_chars: int):
+    """Split text into chunks of at most max_chars at paragraph or sentence boundaries."""
+    start = 0
+    length = len(text)
+    
+    while length - start > max_chars:
+        end = start + max_chars
+        cut = text.rfind('\n\n', start, end)
+        if cut <= start:
+            cut = text.rfind('. ', start, end)
+            if cut > start:
+                cut += 1
+        if cut <= start:
+            cut = end
+        
+        yield text[start:cut]
+        start = cut
+    
+    if start < length:
+        yield text[start:]
+
+
+def _is_word_char(c: str) -> bool:
+    """Check if character counts as word character for regex \\b."""
+    return c.isalnum() or c == '_'
 
 
 class NERExtractor:
     """Extract named entities from texts."""
     
     def __init__(self):
-        self.segmenter = Segmenter()
-        self.morph_vocab = MorphVocab()
-        self.emb = NewsEmbedding()
-        self.morph_tagger = NewsMorphTagger(self.emb)
-        self.ner_tagger = NewsNERTagger(self.emb)
-        
+        self.results = None
+    
+    @cached_property
+    def segmenter(self) -> Segmenter:
+        """Natasha sentence/token segmenter."""
+        return Segmenter()
+    
+    @cached_property
+    def morph_vocab(self) -> MorphVocab:
+        """Natasha morphology vocabulary."""
+        return MorphVocab()
+    
+    @cached_property
+    def emb(self) -> NewsEmbedding:
+        """Natasha news embedding."""
+        return NewsEmbedding()
+    
+    @cached_property
+    def ner_tagger(self) -> NewsNERTagger:
+        """Natasha NER tagger."""
+        return NewsNERTagger(self.emb)
+    
+    @cached_property
+    def nlp_en(self):
+        """spaCy English pipeline, or None if model is not installed."""
         try:
-            self.nlp_en = spacy.load('en_core_web_sm')
+            return spacy.load('en_core_web_sm', disable=config.SPACY_DISABLED_PIPES)
         except OSError:
             print("Warning: spacy model not found. Run: python -m spacy download en_core_web_sm")
-            self.nlp_en = None
-        
-        self.morph = pymorphy3.MorphAnalyzer()
-        
-        self.location_abbr_map = config.load_abbr_map(config.DATA_FILES['location_abbr'])
-        self.journal_markers = set(config.load_text_file(config.DATA_FILES['journal_markers']))
-        self.address_markers = set(config.load_text_file(config.DATA_FILES['address_markers']))
-        
-        self.products = set()
+            return None
+    
+    @cached_property
+    def morph(self) -> pymorphy3.MorphAnalyzer:
+        """pymorphy3 morphological analyzer."""
+        return pymorphy3.MorphAnalyzer()
+    
+    @cached_property
+    def _parse_word(self):
+        """Memoized best pymorphy3 parse of single word."""
+        return lru_cache(maxsize=config.MORPH_CACHE_SIZE)(lambda word: self.morph.parse(word)[0])
+    
+    @cached_property
+    def location_abbr_map(self) -> dict[str, str]:
+        """Location abbreviation mapping."""
+        return config.load_abbr_map(config.DATA_FILES['location_abbr'])
+    
+    @cached_property
+    def journal_markers(self) -> set[str]:
+        """Markers of journal and conference names."""
+        return set(config.load_text_file(config.DATA_FILES['journal_markers']))
+    
+    @cached_property
+    def address_markers(self) -> set[str]:
+        """Markers of postal addresses."""
+        return set(config.load_text_file(config.DATA_FILES['address_markers']))
+    
+    @cached_property
+    def products(self) -> set[str]:
+        """Known software products."""
         products_file = config.DATA_FILES['products']
-        if products_file.exists():
-            self.products = set(config.load_text_file(products_file))
+        if not products_file.exists():
+            return set()
+        return set(config.load_text_file(products_file))
+    
+    @cached_property
+    def _journal_ac(self):
+        """Automaton over journal markers."""
+        return _build_automaton(self.journal_markers)
+    
+    @cached_property
+    def _address_ac(self):
+        """Automaton over address markers."""
+        return _build_automaton(self.address_markers)
+    
+    @cached_property
+    def _org_marker_ac(self):
+        """Automaton over organization markers."""
+        return _build_automaton(_ORG_MARKERS)
+    
+    @cached_property
+    def _exclude_terms_ac(self):
+        """Automaton over person exclusion terms."""
+        return _build_automaton(_PERSON_EXCLUDE_TERMS)
+    
+    @cached_property
+    def _products_ac(self):
+        """Automaton over lowercased product names, keeping all case variants."""
+        if ahocorasick is None or not self.products:
+            return None
         
-        self.results = None
+        by_key = defaultdict(list)
+        for product in self.products:
+            by_key[product.lower()].append(product)
+        
+        automaton = ahocorasick.Automaton()
+        for key, products in by_key.items():
+            automaton.add_word(key, (tuple(sorted(products)), len(key)))
+        automaton.make_automaton()
+        return automaton
+    
+    @cached_property
+    def _product_patterns(self) -> list[tuple[str, re.Pattern]]:
+        """Per-product regexes used without pyahocorasick."""
+        if ahocorasick is not None:
+            return []
+        return [
+            (product, re.compile(r'\b' + re.escape(product) + r'\b', re.IGNORECASE))
+            for product in self.products
+        ]
     
     def _normalize_name(self, name: str) -> str:
         """Normalize person/location name."""
@@ -55,14 +205,14 @@ class NERExtractor:
         if name in self.location_abbr_map:
             return self.location_abbr_map[name]
         
-        return name
+        return _intern(name)
     
     def _normalize_location(self, name: str) -> str:
         """Normalize location to nominative case."""
         words = name.split()
         
         if len(words) > 1:
-            parsed = self.morph.parse(words[0])[0]
+            parsed = self._parse_word(words[0])
             if 'nomn' not in parsed.tag:
                 inflected = parsed.inflect({'nomn'})
                 if inflected:
@@ -76,23 +226,15 @@ class NERExtractor:
         if len(name) < 2:
             return False
         
-        patterns = [
-            r'^[А-ЯЁA-Z][а-яёa-z]+\s+[А-ЯЁA-Z]\.\s*[А-ЯЁA-Z]\.',
-            r'^[А-ЯЁA-Z]\.\s*[А-ЯЁA-Z]\.\s+[А-ЯЁA-Z][а-яёa-z]+',
-            r'^[А-ЯЁA-Z][а-яёa-z]+\s+[А-ЯЁA-Z][а-яёa-z]+',
-        ]
-        
-        for pattern in patterns:
-            if re.match(pattern, name):
-                return True
+        if _PERSON_RE.match(name):
+            return True
         
-        exclude_terms = ['parallel distrib', 'et al', 'proc', 'ieee']
-        if any(term in name.lower() for term in exclude_terms):
+        if _contains_any(self._exclude_terms_ac, _PERSON_EXCLUDE_TERMS, name.lower()):
             return False
         
         words = name.split()
         if len(words) >= 1:
-            parsed = self.morph.parse(words[0])[0]
+            parsed = self._parse_word(words[0])
             if 'Name' in parsed.tag or 'Surn' in parsed.tag or 'Patr' in parsed.tag:
                 return True
         
@@ -103,10 +245,10 @@ class NERExtractor:
         if len(name) < 3:
             return False
         
-        org_markers = ['университет', 'институт', 'university', 'company', 'institute', 'corporation']
-        has_marker = any(marker in name.lower() for marker in org_markers)
+        name_lower = name.lower()
+        has_marker = _contains_any(self._org_marker_ac, _ORG_MARKERS, name_lower)
         
-        if any(marker in name.lower() for marker in self.journal_markers):
+        if _contains_any(self._journal_ac, self.journal_markers, name_lower):
             return False
         
         return has_marker
@@ -116,21 +258,23 @@ class NERExtractor:
         if len(name) < 3:
             return False
         
-        if any(marker in name.lower() for marker in self.address_markers):
+        if _contains_any(self._address_ac, self.address_markers, name.lower()):
             return False
         
         return True
     
     def _extract_entities_ru(self, text: str) -> dict:
         """Extract entities from Russian text."""
-        doc = Doc(text)
-        doc.segment(self.segmenter)
-        doc.tag_morph(self.morph_tagger)
-        doc.tag_ner(self.ner_tagger)
+        spans = []
+        for chunk in _iter_chunks(text, config.NER_CHUNK_CHARS):
+            doc = Doc(chunk)
+            doc.segment(self.segmenter)
+            doc.tag_ner(self.ner_tagger)
+            spans.extend(doc.spans)
         
         entities = defaultdict(list)
         
-        for span in doc.spans:
+        for span in spans:
             if span.type == 'PER':
                 name = self._normalize_name(span.text)
                 if self._validate_person(name):
@@ -148,12 +292,61 @@ class NERExtractor:
         
         return entities
     
-    def _extract_entities_en(self, text: str) -> dict:
-        """Extract entities from English text."""
+    def _load_ru_models(self):
+        """Load Russian NER models so forked workers share them copy-on-write."""
+        self.segmenter
+        self.ner_tagger
+        self.morph
+    
+    def _extract_text_ru(self, text: str) -> tuple[dict, list[str]]:
+        """Extract entities and products from single Russian text."""
+        return self._extract_entities_ru(text), self._extract_products(text)
+    
+    def _iter_entities_ru(self, texts: list[str]):
+        """Extract entities and products from Russian texts in worker processes."""
+        if config.NER_WORKERS > 1 and len(texts) > 1 and forks_by_default():
+            self._load_ru_models()
+        
+        yield from map_in_pool(
+            NERExtractor._extract_text_ru, texts, NERExtractor,
+            shared=self,
+            workers=config.NER_WORKERS,
+            chunksize=config.NER_CHUNKSIZE
+        )
+    
+    def _iter_entities_en(self, texts: list[str]):
+        """Extract entities and products from English texts in batches."""
+        if not texts:
+            return
+        
         if not self.nlp_en:
-            return defaultdict(list)
+            for text in texts:
+                yield defaultdict(list), self._extract_products(text)
+            return
         
-        doc = self.nlp_en(text)
+        chunks = []
+        owners = []
+        for i, text in enumerate(texts):
+            for chunk in _iter_chunks(text, config.NER_CHUNK_CHARS):
+                chunks.append(chunk)
+                owners.append(i)
+        
+        docs = self.nlp_en.pipe(
+            chunks,
+            batch_size=config.NER_BATCH_SIZE,
+            n_process=config.NER_PROCESSES
+        )
+        
+        entities = [defaultdict(list) for _ in texts]
+        for owner, doc in zip(owners, docs):
+            for category, names in self._extract_entities_en(doc).items():
+                entities[owner][category].extend(names)
+        
+        for text, text_entities in zip(texts, entities):
+            yield text_entities, self._extract_products(text)
+    
+    def _extract_entities_en(self, doc) -> dict:
+        """Extract entities from processed English spaCy doc."""
         entities = defaultdict(list)
         
         for ent in doc.ents:
@@ -173,47 +366,62 @@ class NERExtractor:
                     entities['Топонимы'].append(name)
             
             elif ent.label_ == 'PRODUCT':
-                entities['Программные продукты'].append(ent.text)
+                entities['Программные продукты'].append(_intern(ent.text))
         
         return entities
     
     def _extract_products(self, text: str) -> list[str]:
         """Extract software products from text."""
-        found = []
-        for product in self.products:
-            pattern = r'\b' + re.escape(product) + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                found.append(product)
-        return found
+        if self._products_ac is not None:
+            return self._extract_products_ac(text)
+        
+        return [product for product, pattern in self._product_patterns if pattern.search(text)]
+    
+    def _extract_products_ac(self, text: str) -> list[str]:
+        """Extract software products in single Aho-Corasick pass."""
+        text_lower = text.lower()
+        last = len(text_lower) - 1
+        found = {}
+        
+        for end, (products, length) in self._products_ac.iter(text_lower):
+            if products[0] in found:
+                continue
+            start = end - length + 1
+            
+            first_is_word = _is_word_char(text_lower[start])
+            prev_is_word = start > 0 and _is_word_char(text_lower[start - 1])
+            if first_is_word == prev_is_word:
+                continue
+            
+            last_is_word = _is_word_char(text_lower[end])
+            next_is_word = end < last and _is_word_char(text_lower[end + 1])
+            if last_is_word == next_is_word:
+                continue
+            
+            for product in products:
+                found[product] = True
+        
+        return list(found)
     
     def extract_from_corpus(self, corpus: list[dict]) -> dict:
         """Extract entities from entire corpus."""
-        all_entities = defaultdict(list)
+        all_entities = defaultdict(Counter)
         
-        for item in corpus:
-            text = item['text']
-            lang = item.get('language', 'EN')
-            
-            if lang == 'RU':
-                entities = self._extract_entities_ru(text)
-            else:
-                entities = self._extract_entities_en(text)
-            
+        ru_texts = [item['text'] for item in corpus if item.get('language', 'EN') == 'RU']
+        en_texts = [item['text'] for item in corpus if item.get('language', 'EN') != 'RU']
+        
+        extracted = chain(self._iter_entities_ru(ru_texts), self._iter_entities_en(en_texts))
+        
+        for entities, products in extracted:
             for category, names in entities.items():
-                all_entities[category].extend(names)
-            
-            products = self._extract_products(text)
-            all_entities['Программные продукты'].extend(products)
+                all_entities[category].update(names)
+            all_entities['Программные продукты'].update(products)
         
         results_by_category = {}
-        for category, names in all_entities.items():
-            counter = Counter(names)
-            
+        for category, counter in all_entities.items():
             min_freq = config.MIN_PERSON_FREQUENCY if category == 'Персоналии' else config.MIN_ENTITY_FREQUENCY
             
-            filtered = {name: count for name, count in counter.items() if count >= min_freq}
-            
-            sorted_entities = sorted(filtered.items(), key=lambda x: x[1], reverse=True)
+            sorted_entities = [(name, count) for name, count in counter.most_common() if count >= min_freq]
             
             results_by_category[category] = [
                 {'name': name, 'frequency': count}
@@ -0,0 +1,45 @@
+"""Order-preserving process pool shared by the pipeline stages."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+_worker_state = None
+
+
+def forks_by_default() -> bool:
+    """Check if worker processes are forked, so they can share parent's state."""
+    return multiprocessing.get_start_method() == 'fork'
+
+
+def map_in_pool(func, items: list, factory, shared=None, workers: int = 1, chunksize: int = 1):
+    """Yield func(state, item) for each item in order, using worker processes.
+
+    Workers reuse `shared` copy-on-write only when fork is the platform's
+    default start method; otherwise each one builds its own state with
+    `factory()`. Runs in-process for a single worker or item.
+    """
+    workers = min(workers, len(items))
+    if workers <= 1:
+        state = shared if shared is not None else factory()
+        for item in items:
+            yield func(state, item)
+        return
+
+    initargs = (factory, shared if forks_by_default() else None)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=initargs
+    ) as pool:
+        yield from pool.map(partial(_apply, func), items, chunksize=chunksize)
+
+
+def _init_worker(factory, shared=None):
+    """Set up worker state once per process."""
+    global _worker_state
+    _worker_state = shared if shared is not None else factory()
+
+
+def _apply(func, item):
+    """Call func on worker state and item."""
+    return func(_worker_state, item)
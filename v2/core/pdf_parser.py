@@ -1,55 +1,104 @@
 """PDF text extraction module."""
-import fitz
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from langdetect import detect, LangDetectException
+
+import fitz
 from tqdm import tqdm
 
+TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+
+LANG_SAMPLE_SIZE = 4000
+CYRILLIC_SHARE = 0.2
+CYRILLIC_PATTERN = re.compile(r'[\u0400-\u04ff]')
+LETTER_PATTERN = re.compile(r'[^\W\d_]')
+
+
+def detect_language(text: str) -> str:
+    """Detect RU/EN by share of Cyrillic characters in text sample."""
+    sample = text[:LANG_SAMPLE_SIZE]
+    if not LETTER_PATTERN.search(sample):
+        return 'UNKNOWN'
+    
+    cyrillic = len(CYRILLIC_PATTERN.findall(sample))
+    return 'RU' if cyrillic > len(sample) * CYRILLIC_SHARE else 'EN'
+
+
+def extract_pdf(pdf_path: str | Path, output_dir: Path) -> dict:
+    """Extract text from single PDF file and save it to output directory."""
+    pdf_path = Path(pdf_path)
+    with fitz.open(pdf_path) as doc:
+        parts = [page.get_text("text", flags=TEXT_FLAGS) for page in doc]
+    text = "".join(parts)
+    
+    lang = detect_language(text)
+    
+    output_file = output_dir / f"{pdf_path.stem}.txt"
+    output_file.write_bytes(text.encode('utf-8'))
+    
+    return {
+        'filename': pdf_path.name,
+        'char_count': len(text),
+        'language': lang,
+        'output_file': str(output_file)
+    }
+
+
+def read_text(record: dict) -> str:
+    """Read extracted text of record from its output file."""
+    if 'text' in record:
+        return record['text']
+    
+    with open(record['output_file'], 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, 'utf-8')
+
+
+def iter_texts(records: list[dict]):
+    """Yield extracted texts of records in order."""
+    for record in records:
+        yield read_text(record)
+
 
 class PDFParser:
     """Extract text from PDF files."""
     
-    def __init__(self, corpus_dir: Path, output_dir: Path):
+    def __init__(self, corpus_dir: Path, output_dir: Path, workers: int = None):
         self.corpus_dir = Path(corpus_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers
     
-    def extract_text(self, pdf_path: Path) -> dict:
+    def extract_text(self, pdf_path: str | Path) -> dict:
         """Extract text from single PDF file."""
-        doc = fitz.open(pdf_path)
-        text = "".join(page.get_text() for page in doc)
-        doc.close()
-        
-        try:
-            lang = detect(text[:1000])
-            lang = 'RU' if lang == 'ru' else 'EN'
-        except LangDetectException:
-            lang = 'UNKNOWN'
-        
-        output_file = self.output_dir / f"{pdf_path.stem}.txt"
-        output_file.write_text(text, encoding='utf-8')
-        
-        return {
-            'filename': pdf_path.name,
-            'text': text,
-            'char_count': len(text),
-            'language': lang,
-            'output_file': str(output_file)
-        }
+        return extract_pdf(pdf_path, self.output_dir)
     
     def extract_all(self) -> list[dict]:
         """Extract text from all PDFs in corpus directory."""
-        pdf_files = list(self.corpus_dir.glob("*.pdf"))
+        pdf_files = []
+        if self.corpus_dir.is_dir():
+            with os.scandir(self.corpus_dir) as entries:
+                pdf_files = [
+                    entry.path for entry in entries
+                    if entry.is_file() and entry.name.lower().endswith('.pdf')
+                ]
         
         if not pdf_files:
             print(f"No PDF files found in {self.corpus_dir}")
             return []
         
         results = []
-        for pdf_file in tqdm(pdf_files, desc="Extracting PDFs"):
-            try:
-                result = self.extract_text(pdf_file)
-                results.append(result)
-            except Exception as e:
-                print(f"Error processing {pdf_file.name}: {e}")
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(extract_pdf, pdf_file, self.output_dir) for pdf_file in pdf_files]
+            
+            for pdf_file, future in tqdm(zip(pdf_files, futures), total=len(futures), desc="Extracting PDFs"):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Error processing {os.path.basename(pdf_file)}: {e}")
         
         return results
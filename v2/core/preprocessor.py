@@ -1,19 +1,24 @@
 """Text preprocessing: tokenization and lemmatization."""
 import re
-import pymorphy3
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 
 import config
+from core.morph import get_morph
+from core.parallel import map_in_pool
 
 
 class Preprocessor:
     """Text preprocessing pipeline."""
     
+    _TOKEN_RE = re.compile(rf"[^\W\d_]{{{config.MIN_WORD_LENGTH},}}")
+    
     def __init__(self):
-        self.morph_ru = pymorphy3.MorphAnalyzer()
+        self.morph_ru = get_morph()
         self.lemmatizer_en = WordNetLemmatizer()
+        self._ru_cache: dict[str, str] = {}
+        self._en_cache: dict[str, str] = {}
         
         try:
             self.stopwords_ru = set(stopwords.words('russian'))
@@ -24,53 +29,83 @@ class Preprocessor:
             nltk.download('omw-1.4', quiet=True)
             self.stopwords_ru = set(stopwords.words('russian'))
             self.stopwords_en = set(stopwords.words('english'))
+        
+        self._stop = frozenset(self.stopwords_ru | self.stopwords_en)
     
     def tokenize(self, text: str) -> list[str]:
         """Tokenize text into words."""
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\d+', '', text)
-        tokens = text.lower().split()
-        return [t for t in tokens if len(t) >= config.MIN_WORD_LENGTH]
+        return self._TOKEN_RE.findall(text.lower())
     
     def lemmatize_ru(self, word: str) -> str:
         """Lemmatize Russian word."""
-        return self.morph_ru.parse(word)[0].normal_form
+        lemma = self._ru_cache.get(word)
+        if lemma is None:
+            _, _, lemma, _, _ = self.morph_ru.parse(word)[0]
+            self._ru_cache[word] = lemma
+        return lemma
     
     def lemmatize_en(self, word: str) -> str:
         """Lemmatize English word."""
-        return self.lemmatizer_en.lemmatize(word)
+        lemma = self._en_cache.get(word)
+        if lemma is None:
+            lemma = self.lemmatizer_en.lemmatize(word)
+            self._en_cache[word] = lemma
+        return lemma
     
     def lemmatize(self, word: str) -> str:
         """Lemmatize word (auto-detect language)."""
-        if any(1040 <= ord(c) <= 1103 for c in word):
+        if '\u0400' <= word[:1] <= '\u04ff':
             return self.lemmatize_ru(word)
         return self.lemmatize_en(word)
     
     def is_stopword(self, word: str) -> bool:
         """Check if word is stopword."""
-        return word in self.stopwords_ru or word in self.stopwords_en
+        return word in self._stop
     
     def process_text(self, text: str) -> tuple[list[str], list[str]]:
         """Process single text: tokenize and lemmatize."""
         tokens = self.tokenize(text)
         
+        lemmatize_ru = self.lemmatize_ru
+        lemmatize_en = self.lemmatize_en
+        stop = self._stop
+        
         lemmas = []
         for token in tokens:
-            if not self.is_stopword(token):
-                lemma = self.lemmatize(token)
-                if not self.is_stopword(lemma):
+            if token not in stop:
+                if '\u0400' <= token[0] <= '\u04ff':
+                    lemma = lemmatize_ru(token)
+                else:
+                    lemma = lemmatize_en(token)
+                if lemma not in stop:
                     lemmas.append(lemma)
         
         return tokens, lemmas
     
+    def lemmatize_text(self, text: str) -> list[str]:
+        """Get lemmas of single text without stopwords."""
+        return self.process_text(text)[1]
+    
     def process_texts(self, texts: list[str]) -> tuple[list[list[str]], list[list[str]]]:
         """Process multiple texts."""
         all_tokens = []
         all_lemmas = []
         
-        for text in texts:
-            tokens, lemmas = self.process_text(text)
+        for tokens, lemmas in self._map(Preprocessor.process_text, texts):
             all_tokens.append(tokens)
             all_lemmas.append(lemmas)
         
         return all_tokens, all_lemmas
+    
+    def lemmatize_texts(self, texts: list[str]) -> list[list[str]]:
+        """Get lemmas of multiple texts, without sending tokens back from workers."""
+        return list(self._map(Preprocessor.lemmatize_text, texts))
+    
+    def _map(self, func, texts: list[str]):
+        """Apply preprocessor method to texts in worker processes, preserving order."""
+        return map_in_pool(
+            func, texts, Preprocessor,
+            shared=self,
+            workers=config.PREPROCESS_WORKERS,
+            chunksize=config.PREPROCESS_CHUNKSIZE
+        )
@@ -1,24 +1,56 @@
 """Terminological index builder with TF-IDF."""
+import heapq
 import re
-import math
 from collections import Counter, defaultdict
 from pathlib import Path
+import numpy as np
 import pandas as pd
-import pymorphy3
 
 import config
+from core.morph import get_morph
+
+TOKEN_PATTERN = re.compile(r'\b[а-яёa-z]+\b')
+ABBR_PATTERN = re.compile(r'\b([A-ZА-ЯЁ]{2,})\s*\(([^)]+)\)')
+ABBR_CLOSE_PATTERN = re.compile(r'([A-ZА-ЯЁ]{2,})\)')
+
+
+def _iter_reverse_abbreviations(text: str):
+    """Yield (expansion, abbr) pairs for "expansion (ABBR)" in single linear scan.
+    
+    Equivalent to finditer of r'([^(]+)\\s*\\(([A-ZА-ЯЁ]{2,})\\)', which backtracks
+    quadratically over text between parentheses.
+    """
+    pos = 0
+    length = len(text)
+    
+    while pos < length:
+        while pos < length and text[pos] == '(':
+            pos += 1
+        
+        paren = text.find('(', pos)
+        if paren == -1:
+            return
+        
+        match = ABBR_CLOSE_PATTERN.match(text, paren + 1)
+        if match:
+            yield text[pos:paren], match.group(1)
+            pos = match.end()
+        else:
+            pos = paren + 1
 
 
 class TermIndexBuilder:
     """Build terminological index using TF-IDF."""
     
     def __init__(self):
-        self.morph = pymorphy3.MorphAnalyzer()
+        self.morph = get_morph()
+        self._valid_cache: dict[str, bool] = {}
         
         self.domain_terms = set()
         domain_file = config.DATA_FILES['domain_terms']
         if domain_file.exists():
             self.domain_terms = set(config.load_text_file(domain_file))
+        self._domain_array = np.array(sorted(self.domain_terms), dtype=object)
         
         self.abbr_stopwords = set()
         abbr_file = config.DATA_FILES['abbr_stopwords']
@@ -29,93 +61,84 @@ class TermIndexBuilder:
     
     def is_valid_term(self, word: str) -> bool:
         """Check if word is valid term (noun or adjective)."""
-        parsed = self.morph.parse(word)[0]
-        return 'NOUN' in parsed.tag or 'ADJF' in parsed.tag
+        valid = self._valid_cache.get(word)
+        if valid is None:
+            _, tag, _, _, _ = self.morph.parse(word)[0]
+            valid = 'NOUN' in tag or 'ADJF' in tag
+            self._valid_cache[word] = valid
+        return valid
+    
+    def _score_terms(self, max_tf: dict[str, float], df: dict[str, int], num_docs: int) -> list[dict]:
+        """Score terms with TF-IDF from their best per-document TF."""
+        if not max_tf:
+            return []
+        
+        vocab = list(max_tf)
+        n = len(vocab)
+        tf = np.fromiter(max_tf.values(), dtype=np.float64, count=n)
+        doc_freq = np.fromiter((df[term] for term in vocab), dtype=np.float64, count=n)
+        in_domain = np.isin(np.array(vocab, dtype=object), self._domain_array)
+        boost = np.where(in_domain, config.DOMAIN_BOOST, 1.0)
+        idf = np.log(num_docs / doc_freq) + 1
+        
+        scores = tf * idf * boost
+        order = np.argsort(-scores, kind='stable')
+        
+        return [
+            {'term': vocab[i], 'tfidf_score': float(scores[i]), 'in_domain': bool(in_domain[i])}
+            for i in order if scores[i] > 0
+        ]
+    
+    def _tokenize(self, text: str) -> list[str]:
+        """Tokenize text into lowercase words."""
+        return TOKEN_PATTERN.findall(text.lower())
+    
+    def _count_terms(self, words: list[str], max_tf: dict[str, float], df: dict[str, int]):
+        """Update best TF and DF of single words with one document."""
+        words = [w for w in words if len(w) >= 3]
+        word_freq = Counter(words)
+        for word, freq in word_freq.items():
+            df[word] += 1
+            tf = freq / len(words)
+            if tf > max_tf.get(word, 0):
+                max_tf[word] = tf
+    
+    def _count_ngrams(self, words: list[str], n: int, max_tf: dict[str, float], df: dict[str, int]):
+        """Update best TF and DF of n-grams with one document."""
+        ngrams = [' '.join(gram) for gram in zip(*(words[i:] for i in range(n)))]
+        ngram_freq = Counter(ngrams)
+        for ngram, freq in ngram_freq.items():
+            df[ngram] += 1
+            if freq < config.MIN_TERM_FREQUENCY:
+                continue
+            
+            tf = freq / len(ngrams)
+            if tf > max_tf.get(ngram, 0):
+                max_tf[ngram] = tf
+    
+    def _score_words(self, max_tf: dict[str, float], df: dict[str, int], num_docs: int) -> list[dict]:
+        """Score single words, keeping only valid terms."""
+        max_tf = {word: tf for word, tf in max_tf.items() if self.is_valid_term(word)}
+        return self._score_terms(max_tf, df, num_docs)
     
     def extract_terms(self, texts: list[str]) -> list[dict]:
         """Extract single-word terms with TF-IDF."""
-        doc_words = []
+        max_tf, df = {}, defaultdict(int)
         for text in texts:
-            words = re.findall(r'\b[а-яёa-z]{3,}\b', text.lower())
-            doc_words.append(words)
+            self._count_terms(self._tokenize(text), max_tf, df)
         
-        df = defaultdict(int)
-        for words in doc_words:
-            unique_words = set(words)
-            for word in unique_words:
-                df[word] += 1
-        
-        num_docs = len(texts)
-        term_scores = {}
-        
-        for words in doc_words:
-            word_freq = Counter(words)
-            for word, freq in word_freq.items():
-                if not self.is_valid_term(word):
-                    continue
-                
-                tf = freq / len(words) if words else 0
-                idf = math.log(num_docs / df[word]) + 1 if df[word] > 0 else 0
-                tfidf = tf * idf
-                
-                if word in self.domain_terms:
-                    tfidf *= config.DOMAIN_BOOST
-                
-                if word not in term_scores or tfidf > term_scores[word]:
-                    term_scores[word] = tfidf
-        
-        sorted_terms = sorted(term_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        return [
-            {'term': word, 'tfidf_score': score, 'in_domain': word in self.domain_terms}
-            for word, score in sorted_terms if score > 0
-        ]
+        return self._score_words(max_tf, df, len(texts))
     
     def extract_ngrams(self, texts: list[str], n: int) -> list[dict]:
         """Extract n-grams with TF-IDF."""
-        doc_ngrams = []
+        max_tf, df = {}, defaultdict(int)
         for text in texts:
-            words = re.findall(r'\b[а-яёa-z]+\b', text.lower())
-            ngrams = [' '.join(words[i:i+n]) for i in range(len(words)-n+1)]
-            doc_ngrams.append(ngrams)
+            self._count_ngrams(self._tokenize(text), n, max_tf, df)
         
-        df = defaultdict(int)
-        for ngrams in doc_ngrams:
-            unique_ngrams = set(ngrams)
-            for ngram in unique_ngrams:
-                df[ngram] += 1
-        
-        num_docs = len(texts)
-        ngram_scores = {}
-        
-        for ngrams in doc_ngrams:
-            ngram_freq = Counter(ngrams)
-            for ngram, freq in ngram_freq.items():
-                if freq < config.MIN_TERM_FREQUENCY:
-                    continue
-                
-                tf = freq / len(ngrams) if ngrams else 0
-                idf = math.log(num_docs / df[ngram]) + 1 if df[ngram] > 0 else 0
-                tfidf = tf * idf
-                
-                if ngram in self.domain_terms:
-                    tfidf *= config.DOMAIN_BOOST
-                
-                if ngram not in ngram_scores or tfidf > ngram_scores[ngram]:
-                    ngram_scores[ngram] = tfidf
-        
-        sorted_ngrams = sorted(ngram_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        return [
-            {'term': ngram, 'tfidf_score': score, 'in_domain': ngram in self.domain_terms}
-            for ngram, score in sorted_ngrams if score > 0
-        ]
+        return self._score_terms(max_tf, df, len(texts))
     
     def extract_abbreviations(self, texts: list[str]) -> list[dict]:
         """Extract abbreviations with expansions."""
-        ABBR_PATTERN = re.compile(r'\b([A-ZА-ЯЁ]{2,})\s*\(([^)]+)\)')
-        REVERSE_PATTERN = re.compile(r'([^(]+)\s*\(([A-ZА-ЯЁ]{2,})\)')
-        
         abbr_expansions = defaultdict(set)
         
         for text in texts:
@@ -124,16 +147,14 @@ class TermIndexBuilder:
                 expansion = ' '.join(match.group(2).split())
                 abbr_expansions[abbr].add(expansion)
             
-            for match in REVERSE_PATTERN.finditer(text):
-                expansion = ' '.join(match.group(1).strip().split())
-                abbr = match.group(2)
+            for expansion, abbr in _iter_reverse_abbreviations(text):
+                expansion = ' '.join(expansion.strip().split())
                 abbr_expansions[abbr].add(expansion)
         
         results = []
-        var_pattern = re.compile(r'^[A-Z][0-9]$')
         
         for abbr, expansions in abbr_expansions.items():
-            if abbr in self.abbr_stopwords or var_pattern.match(abbr):
+            if abbr in self.abbr_stopwords:
                 continue
             
             expansion = list(expansions)[0] if len(expansions) == 1 else '; '.join(expansions)
@@ -149,27 +170,35 @@ class TermIndexBuilder:
     
     def build_index(self, texts: list[str]) -> dict:
         """Build complete terminological index."""
-        terms = self.extract_terms(texts)
-        bigrams = self.extract_ngrams(texts, 2)
-        trigrams = self.extract_ngrams(texts, 3)
-        abbreviations = self.extract_abbreviations(texts)
+        term_counts = ({}, defaultdict(int))
+        bigram_counts = ({}, defaultdict(int))
+        trigram_counts = ({}, defaultdict(int))
         
-        all_terms = terms + bigrams + trigrams
+        for text in texts:
+            words = self._tokenize(text)
+            self._count_terms(words, *term_counts)
+            self._count_ngrams(words, 2, *bigram_counts)
+            self._count_ngrams(words, 3, *trigram_counts)
         
-        domain_terms = [t for t in all_terms if t['in_domain']]
-        other_terms = [t for t in all_terms if not t['in_domain']]
+        num_docs = len(texts)
+        terms = self._score_words(*term_counts, num_docs)
+        bigrams = self._score_terms(*bigram_counts, num_docs)
+        trigrams = self._score_terms(*trigram_counts, num_docs)
+        abbreviations = self.extract_abbreviations(texts)
         
-        domain_terms.sort(key=lambda x: x['tfidf_score'], reverse=True)
-        other_terms.sort(key=lambda x: x['tfidf_score'], reverse=True)
+        all_terms = terms + bigrams + trigrams
         
-        diversified = domain_terms + other_terms
+        diversified = heapq.nlargest(
+            config.TOP_WORDS_LIMIT, all_terms,
+            key=lambda x: (x['in_domain'], x['tfidf_score'])
+        )
         
         self.results = {
             'terms': terms,
             'bigrams': bigrams,
             'trigrams': trigrams,
             'abbreviations': abbreviations,
-            'all_terms': diversified[:config.TOP_WORDS_LIMIT],
+            'all_terms': diversified,
             'total': len(terms) + len(bigrams) + len(trigrams) + len(abbreviations),
             'domain_count': sum(1 for t in all_terms if t['in_domain'])
         }
@@ -10,7 +10,7 @@ from rich.table import Table
 sys.path.insert(0, str(Path(__file__).parent))
 
 import config
-from core.pdf_parser import PDFParser
+from core.pdf_parser import PDFParser, iter_texts
 from core.preprocessor import Preprocessor
 from core.frequency import FrequencyAnalyzer
 from core.term_index import TermIndexBuilder
@@ -58,8 +58,8 @@ def cmd_analyze(args):
         return
     
     preprocessor = Preprocessor()
-    texts = [item['text'] for item in extracted]
-    tokens, lemmas = preprocessor.process_texts(texts)
+    texts = list(iter_texts(extracted))
+    lemmas = preprocessor.lemmatize_texts(texts)
     
     analyzer = FrequencyAnalyzer()
     results = analyzer.analyze(lemmas)
@@ -85,7 +85,7 @@ def cmd_terms(args):
         return
     
     builder = TermIndexBuilder()
-    texts = [item['text'] for item in extracted]
+    texts = list(iter_texts(extracted))
     results = builder.build_index(texts)
     
     builder.save_results(config.OUTPUT_DIR)
@@ -109,8 +109,10 @@ def cmd_names(args):
         console.print("[red]Ошибка: сначала выполните extract[/red]")
         return
     
+    corpus = [dict(item, text=text) for item, text in zip(extracted, iter_texts(extracted))]
+    
     extractor = NERExtractor()
-    results = extractor.extract_from_corpus(extracted)
+    results = extractor.extract_from_corpus(corpus)
     
     extractor.save_results(config.OUTPUT_DIR)
     cache.save('names', results)